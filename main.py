@@ -1,12 +1,61 @@
+import base64
 import json
 import os
+import random
 import re
-from collections import deque
+import sys
+from array import array
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
-EMPTY = "."      # 空点
-BLACK = "B"      # 黑子
-WHITE = "W"      # 白子
+try:
+    import orjson  # 可选：存档序列化更快
+except ImportError:
+    orjson = None
+
+EMPTY = 0        # 空点
+BLACK = 1        # 黑子
+WHITE = 2        # 白子
+
+# 仅在显示 / 存档边界做字符 <-> 编码转换
+COLOR_CHR = {EMPTY: ".", BLACK: "B", WHITE: "W"}
+CHR_COLOR = {v: k for k, v in COLOR_CHR.items()}
+# bytes.translate 用的编码 -> 字符映射表
+_DISPLAY_TABLE = bytes.maketrans(bytes(COLOR_CHR),
+                                 "".join(COLOR_CHR.values()).encode("ascii"))
+
+# 指令参数格式（不含指令名），模块加载时编译一次
+_MOVE_RE = re.compile(r"(\d+)\s+(\d+)")
+_FILENAME_RE = re.compile(r"(\S+)")
+
+_ZOBRIST: Optional[List[Tuple[int, int, int]]] = None
+
+
+def _zobrist_table() -> List[Tuple[int, int, int]]:
+    """Zobrist 随机数表：每个格点对应 (空, 黑, 白) 三个 64 位整数，空点取 0"""
+    global _ZOBRIST
+    if _ZOBRIST is None:
+        rng = random.Random(0)
+        _ZOBRIST = [(0, rng.getrandbits(64), rng.getrandbits(64))
+                    for _ in range(19 * 19)]
+    return _ZOBRIST
+
+
+# ───────────────────────────────────────────────
+# 内核：只接收原始缓冲区与整数的自由函数，供规则类调用
+# ───────────────────────────────────────────────
+def liberty_mask(group: int, empty: int, stride: int) -> int:
+    """位棋盘 group 的全部气：四向各移一步后与空点相交（哨兵列保证不跨行）"""
+    return ((group << 1) | (group >> 1)
+            | (group << stride) | (group >> stride)) & empty
+
+
+def find_root(parent: List[int], idx: int) -> int:
+    """并查集查根，带路径减半"""
+    while parent[idx] != idx:
+        parent[idx] = parent[parent[idx]]
+        idx = parent[idx]
+    return idx
 
 
 # ───────────────────────────────────────────────
@@ -19,22 +68,60 @@ class Board:
         if not 8 <= size <= 19:
             raise ValueError("棋盘大小必须在 8~19 之间")
         self.size = size
-        self.grid: List[List[str]] = [[EMPTY for _ in range(size)]
-                                      for _ in range(size)]
-        self.history: deque = deque()  # (x, y, color, captured) 方便悔棋
+        self._header = "   " + " ".join(f"{i:2}" for i in range(size))
+        # 一维 uint8 缓冲区，(x,y) 存于 y*size+x
+        self.grid = bytearray(size * size)
+        self.empty_count = size * size  # 空点数，随落子 / 提子增减
+        # 每个格点的相邻格点下标（2~4 个），按棋盘大小一次算好
+        self.neighbors: List[Tuple[int, ...]] = [
+            tuple(ny * size + nx
+                  for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                  if 0 <= nx < size and 0 <= ny < size)
+            for y in range(size) for x in range(size)]
+        # 位棋盘：bb[EMPTY/BLACK/WHITE] 各为一个大整数，(x,y) 对应第 y*stride+x 位。
+        # 每行末尾多留一位恒为 0 的哨兵列，按方向移位时不会跨行
+        self.stride = size + 1
+        self.mask = 0
+        for y in range(size):
+            self.mask |= ((1 << size) - 1) << (y * self.stride)
+        self.bb = [self.mask, 0, 0]
+        # 一维下标 -> 位棋盘上的单点掩码
+        self.bits = [1 << (idx + idx // size) for idx in range(size * size)]
+        # Zobrist 哈希随落子 / 提子增量异或维护
+        self._ztable = _zobrist_table()
+        self.zobrist = 0
+        # 棋谱（悔棋用），按字段分存于平行数组：
+        # 第 k 手为 (hx[k], hy[k], hc[k])，其提子的一维下标为
+        # hcap_flat[hcap_off[k]:hcap_off[k+1]]
+        self.hx = array("h")
+        self.hy = array("h")
+        self.hc = array("b")
+        self.hcap_flat = array("i")
+        self.hcap_off = array("i", [0])
 
     # ── 工具 ─────────────────────────────────────
     def in_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.size and 0 <= y < self.size
 
-    def get(self, x: int, y: int) -> str:
-        return self.grid[y][x]
+    def get(self, x: int, y: int) -> int:
+        return self.grid[y * self.size + x]
+
+    def set(self, x: int, y: int, color: int):
+        idx = y * self.size + x
+        old = self.grid[idx]
+        bit = 1 << (y * self.stride + x)
+        self.bb[old] ^= bit
+        self.bb[color] ^= bit
+        self.zobrist ^= self._ztable[idx][old] ^ self._ztable[idx][color]
+        self.empty_count += (color == EMPTY) - (old == EMPTY)
+        self.grid[idx] = color
 
-    def set(self, x: int, y: int, color: str):
-        self.grid[y][x] = color
+    def key(self) -> int:
+        """当前局面的 Zobrist 哈希，可作局面缓存的键"""
+        return self.zobrist
 
     # ── 基本操作 ─────────────────────────────────
-    def place_stone(self, x: int, y: int, color: str) -> None:
+    def place_stone(self, x: int, y: int, color: int) -> None:
         """在 (x,y) 放置颜色 color 的棋子（不检查合法性，由 Rule 决定）"""
         if not self.in_bounds(x, y):
             raise ValueError("坐标越界")
@@ -44,29 +131,72 @@ class Board:
 
     def remove_stones(self, stones: List[Tuple[int, int]]) -> None:
         """批量移除棋子（提子）"""
+        grid, n, table, bb = self.grid, self.size, self._ztable, self.bb
         for (x, y) in stones:
-            self.set(x, y, EMPTY)
+            idx = y * n + x
+            bit = 1 << (y * self.stride + x)
+            bb[grid[idx]] ^= bit
+            bb[EMPTY] |= bit
+            self.zobrist ^= table[idx][grid[idx]]
+            grid[idx] = EMPTY
+        self.empty_count += len(stones)
+
+    # ── 棋谱 ─────────────────────────────────────
+    def record(self, x: int, y: int, color: int, captured=()) -> None:
+        """记录一手棋，captured 为被提子的一维下标"""
+        self.hx.append(x)
+        self.hy.append(y)
+        self.hc.append(color)
+        self.hcap_flat.extend(captured)
+        self.hcap_off.append(len(self.hcap_flat))
+
+    def pop_record(self) -> Tuple[int, int, int, array]:
+        """弹出最后一手棋，返回 (x, y, color, captured)"""
+        self.hcap_off.pop()
+        start = self.hcap_off[-1]
+        captured = self.hcap_flat[start:]
+        del self.hcap_flat[start:]
+        return self.hx.pop(), self.hy.pop(), self.hc.pop(), captured
 
     # ── 显示 ─────────────────────────────────────
     def display(self) -> None:
-        """控制台打印棋盘"""
-        header = "   " + " ".join(f"{i:2}" for i in range(self.size))
-        print(header)
-        for y in range(self.size):
-            row = f"{y:2} " + " ".join(self.grid[y][x] for x in range(self.size))
-            print(row)
-        print()
+        """控制台打印棋盘（拼成整块字符串后一次写出）"""
+        n = self.size
+        cells = self.grid.translate(_DISPLAY_TABLE).decode("ascii")
+        rows = [f"{y:2} " + " ".join(cells[y * n:(y + 1) * n]) for y in range(n)]
+        sys.stdout.write(self._header + "\n" + "\n".join(rows) + "\n\n")
 
     # ── 保存 / 读取 ───────────────────────────────
     def to_dict(self) -> dict:
-        return {"size": self.size, "grid": self.grid,
-                "history": list(self.history)}
+        # 棋盘与棋谱都直接存原始字节的 base64，免去逐格转字符串
+        grid = base64.b64encode(self.grid).decode("ascii")
+        history = {name: base64.b64encode(getattr(self, name).tobytes()).decode("ascii")
+                   for name in ("hx", "hy", "hc", "hcap_flat", "hcap_off")}
+        return {"size": self.size, "grid_b64": grid, "history": history}
 
     @staticmethod
     def from_dict(data: dict) -> "Board":
         board = Board(data["size"])
-        board.grid = data["grid"]
-        board.history = deque([tuple(h) for h in data["history"]])
+        if "grid_b64" in data:
+            board.grid = bytearray(base64.b64decode(data["grid_b64"]))
+        else:  # 旧存档：逐格字符
+            board.grid = bytearray(CHR_COLOR[c] for row in data["grid"] for c in row)
+        board.empty_count = board.grid.count(EMPTY)
+        board.bb = [0, 0, 0]
+        for idx, c in enumerate(board.grid):
+            board.zobrist ^= board._ztable[idx][c]
+            board.bb[c] |= 1 << (idx // board.size * board.stride + idx % board.size)
+        history = data["history"]
+        if isinstance(history, dict):
+            for name in ("hx", "hy", "hc", "hcap_flat", "hcap_off"):
+                arr = array(getattr(board, name).typecode)
+                arr.frombytes(base64.b64decode(history[name]))
+                setattr(board, name, arr)
+        else:  # 旧存档：[(x, y, color, [(cx, cy), ...]), ...]
+            n = board.size
+            for x, y, color, captured in history:
+                board.record(x, y, CHR_COLOR[color],
+                             [cy * n + cx for cx, cy in captured])
         return board
 
 
@@ -83,26 +213,27 @@ class Rule:
         self.passes_in_row = 0  # 围棋用
 
     # ↓ 抽象接口 ↓
-    def is_valid_move(self, x: int, y: int, color: str) -> bool:
+    def is_valid_move(self, x: int, y: int, color: int) -> bool:
         raise NotImplementedError
 
-    def apply_move(self, x: int, y: int, color: str) -> bool:
+    def apply_move(self, x: int, y: int, color: int) -> bool:
         """执行落子，返回是否导致终局"""
         raise NotImplementedError
 
     def undo(self) -> None:
         """悔棋：回溯一步棋"""
-        if not self.board.history:
+        if not self.board.hx:
             raise ValueError("无棋可悔")
-        x, y, color, captured = self.board.history.pop()
+        x, y, color, captured = self.board.pop_record()
         # 撤回当前落子
         self.board.set(x, y, EMPTY)
         # 恢复被提掉的棋子
-        for cx, cy in captured:
-            self.board.set(cx, cy, self.opposite(color))
+        n = self.board.size
+        for idx in captured:
+            self.board.set(idx % n, idx // n, self.opposite(color))
 
-    def opposite(self, color: str) -> str:
-        return BLACK if color == WHITE else WHITE
+    def opposite(self, color: int) -> int:
+        return BLACK + WHITE - color  # 1 <-> 2
 
 
 # ───────────────────────────────────────────────
@@ -110,6 +241,14 @@ class Rule:
 # ───────────────────────────────────────────────
 class GomokuRule(Rule):
     name = "gomoku"
+    DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))  # 横、竖、↘、↗
+
+    def __init__(self, board: Board):
+        super().__init__(board)
+        # runs[d][idx]：方向 d 上一段同色连子的长度，只保证段的两端准确
+        n2 = board.size * board.size
+        self.runs = [bytearray(n2) for _ in self.DIRECTIONS]
+        self._rebuild_runs()
 
     def is_valid_move(self, x, y, color):
         # 仅需检查落点为空
@@ -117,39 +256,57 @@ class GomokuRule(Rule):
 
     def apply_move(self, x, y, color):
         self.board.place_stone(x, y, color)
-        self.board.history.append((x, y, color, []))  # 五子棋无提子
+        self.board.record(x, y, color)  # 五子棋无提子
         # 判断是否连成 5
-        if self._five_in_a_row(x, y, color):
-            print(f"✪ {color} 方连成五子！获胜！")
+        if self._update_runs(x, y, color) >= 5:
+            print(f"✪ {COLOR_CHR[color]} 方连成五子！获胜！")
             return True
         # 平局
-        if all(self.board.get(i, j) != EMPTY
-               for i in range(self.board.size)
-               for j in range(self.board.size)):
+        if self.board.empty_count == 0:
             print("棋盘已满，平局！")
             return True
         return False
 
-    def _five_in_a_row(self, x, y, color):
-        """检查 4 个方向是否存在连续 5 子"""
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        for dx, dy in directions:
-            cnt = 1
-            # 正方向
-            i, j = x + dx, y + dy
-            while self.board.in_bounds(i, j) and self.board.get(i, j) == color:
-                cnt += 1
-                i += dx
-                j += dy
-            # 反方向
-            i, j = x - dx, y - dy
-            while self.board.in_bounds(i, j) and self.board.get(i, j) == color:
-                cnt += 1
-                i -= dx
-                j -= dy
-            if cnt >= 5:
-                return True
-        return False
+    def undo(self) -> None:
+        super().undo()
+        self._rebuild_runs()
+
+    def _update_runs(self, x, y, color):
+        """把 (x,y) 接到四个方向相邻的连子段上，返回过 (x,y) 的最长连子数。
+        落点两侧的邻子必是各自段的端点，读到的长度准确，只需改写新段两端"""
+        n, grid = self.board.size, self.board.grid
+        idx = y * n + x
+        longest = 1
+        for run, (dx, dy) in zip(self.runs, self.DIRECTIONS):
+            step = dy * n + dx
+            left = right = 0
+            if 0 <= x - dx < n and 0 <= y - dy < n and grid[idx - step] == color:
+                left = run[idx - step]
+            if 0 <= x + dx < n and 0 <= y + dy < n and grid[idx + step] == color:
+                right = run[idx + step]
+            total = left + 1 + right
+            run[idx - left * step] = run[idx + right * step] = run[idx] = total
+            if total > longest:
+                longest = total
+        return longest
+
+    def _rebuild_runs(self):
+        """按当前棋盘重算各段两端的长度（初始化 / 读档 / 悔棋后调用）"""
+        n, grid = self.board.size, self.board.grid
+        for run, (dx, dy) in zip(self.runs, self.DIRECTIONS):
+            run[:] = bytes(n * n)
+            step = dy * n + dx
+            for idx, stone in enumerate(grid):
+                if stone == EMPTY:
+                    continue
+                x, y = idx % n, idx // n
+                if 0 <= x - dx < n and 0 <= y - dy < n and grid[idx - step] == stone:
+                    continue  # 不是段首
+                k = 1
+                while (0 <= x + k * dx < n and 0 <= y + k * dy < n
+                       and grid[idx + k * step] == stone):
+                    k += 1
+                run[idx] = run[idx + (k - 1) * step] = k
 
 
 # ───────────────────────────────────────────────
@@ -158,96 +315,170 @@ class GomokuRule(Rule):
 class GoRule(Rule):
     name = "go"
 
+    def __init__(self, board: Board):
+        super().__init__(board)
+        # 合法性只取决于局面，按 Zobrist 键缓存，局面变了键自然不同，无需手动失效
+        self._valid_cached = lru_cache(maxsize=65536)(self._check_move)
+        self._legal_cached = lru_cache(maxsize=1024)(self._list_moves)
+        # 并查集各数组按格点数一次性分配，之后只原地改写
+        n2 = board.size * board.size
+        self.parent = list(range(n2))
+        self.next_stone = list(range(n2))  # 同块棋子首尾相连成环，用于遍历整块
+        self.count = [1] * n2              # 根结点 -> 块内棋子数
+        self.group_bb = list(board.bits)   # 根结点 -> 块的位棋盘
+        self._rebuild()
+
     def is_valid_move(self, x, y, color):
+        return self._valid_cached(self.board.key(), x, y, color)
+
+    def legal_moves(self, color) -> Tuple[Tuple[int, int], ...]:
+        """列出 color 方全部合法落点 (x, y)"""
+        return self._legal_cached(self.board.key(), color)
+
+    def _list_moves(self, zkey, color):
+        """zkey 仅作缓存键"""
+        n = self.board.size
+        grid, neighbors = self.board.grid, self.board.neighbors
+        moves = []
+        for idx, stone in enumerate(grid):
+            if stone != EMPTY:
+                continue
+            # 常见情形：有相邻空点必然合法；只有四周全是棋子的点才需细查
+            for nidx in neighbors[idx]:
+                if grid[nidx] == EMPTY:
+                    moves.append((idx % n, idx // n))
+                    break
+            else:
+                if self.is_valid_move(idx % n, idx // n, color):
+                    moves.append((idx % n, idx // n))
+        return tuple(moves)
+
+    def _check_move(self, zkey, x, y, color):
+        """zkey 仅作缓存键"""
         # 坐标合法 & 为空
         if not (self.board.in_bounds(x, y) and self.board.get(x, y) == EMPTY):
             return False
-        # 检查自杀：如果落子后本方无气且没有提子，则不合法
-        self.board.place_stone(x, y, color)
-        captured = self._capture_opponents(x, y, color, pretend=True)
-        if self._group_has_liberty(x, y, color) or captured:
-            self.board.set(x, y, EMPTY)  # 还原
-            return True
-        self.board.set(x, y, EMPTY)
-        return False
+        # 检查自杀：落子后本方连通块除 (x,y) 外仍有气，或能提掉对方棋子，才合法
+        grid = self.board.grid
+        idx = y * self.board.size + x
+        nbrs = self.board.neighbors[idx]
+        for nidx in nbrs:
+            if grid[nidx] == EMPTY:
+                return True
+        bit = self.board.bits[idx]
+        own = bit
+        for nidx in nbrs:
+            group = self.group_bb[find_root(self.parent, nidx)]
+            if grid[nidx] == color:
+                own |= group
+            elif self._liberties(group) == bit:  # 唯一的气被堵上，可提子
+                return True
+        return (self._liberties(own) & ~bit) != 0
 
     def apply_move(self, x, y, color):
         if x == -1 and y == -1:  # pass
             self.passes_in_row += 1
-            print(f"{color} 方选择 Pass（{self.passes_in_row} 连 pass）")
+            print(f"{COLOR_CHR[color]} 方选择 Pass（{self.passes_in_row} 连 pass）")
             # 连续两次 pass 判终局
             return self.passes_in_row >= 2
         else:
             self.passes_in_row = 0  # 重置 pass 计数
 
         self.board.place_stone(x, y, color)
-        captured = self._capture_opponents(x, y, color, pretend=False)
-        self.board.history.append((x, y, color, captured))
+        self._add_stone(x, y, color)
+        captured = self._capture_opponents(x, y, color)
+        self.board.record(x, y, color, captured)
         return False  # 围棋终局由 pass 或投降等决定
 
-    # ── 私有工具 ────────────────────────────────
-    def _neighbors(self, x, y):
-        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            nx, ny = x + dx, y + dy
-            if self.board.in_bounds(nx, ny):
-                yield nx, ny
-
-    def _group_dfs(self, x, y, color):
-        """返回与 (x,y) 同色连通块 & 其气"""
-        stack = [(x, y)]
-        visited = set()
-        liberties = set()
-        group = []
-        while stack:
-            cx, cy = stack.pop()
-            if (cx, cy) in visited:
+    def undo(self) -> None:
+        super().undo()
+        self._rebuild()
+
+    # ── 并查集 + 位棋盘：增量维护连通块 ──────────
+    def _rebuild(self):
+        """按当前棋盘从头建立并查集（初始化 / 读档 / 悔棋后调用）"""
+        n = self.board.size
+        grid = self.board.grid
+        self.parent[:] = range(n * n)
+        self.next_stone[:] = range(n * n)
+        self.count[:] = [1] * (n * n)
+        self.group_bb[:] = self.board.bits
+        for idx, stone in enumerate(grid):
+            if stone == EMPTY:
                 continue
-            visited.add((cx, cy))
-            group.append((cx, cy))
-            for nx, ny in self._neighbors(cx, cy):
-                if self.board.get(nx, ny) == color:
-                    stack.append((nx, ny))
-                elif self.board.get(nx, ny) == EMPTY:
-                    liberties.add((nx, ny))
-        return group, liberties
-
-    def _group_has_liberty(self, x, y, color):
-        _, libs = self._group_dfs(x, y, color)
-        return len(libs) > 0
-
-    def _capture_opponents(self, x, y, color, pretend=False):
-        """提掉邻近无气的对方棋子，返回被提子的列表"""
+            x, y = idx % n, idx // n
+            if x + 1 < n and grid[idx + 1] == stone:
+                self._union(idx, idx + 1)
+            if y + 1 < n and grid[idx + n] == stone:
+                self._union(idx, idx + n)
+
+    def _union(self, a, b):
+        ra, rb = find_root(self.parent, a), find_root(self.parent, b)
+        if ra == rb:
+            return ra
+        if self.count[ra] < self.count[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.count[ra] += self.count[rb]
+        self.group_bb[ra] |= self.group_bb[rb]
+        # 交换两环的后继即把两环接成一个
+        nxt = self.next_stone
+        nxt[ra], nxt[rb] = nxt[rb], nxt[ra]
+        return ra
+
+    def _liberties(self, group):
+        """块位棋盘 -> 其气的位棋盘，为 0 即无气"""
+        return liberty_mask(group, self.board.bb[EMPTY], self.board.stride)
+
+    def _add_stone(self, x, y, color):
+        """(x,y) 已落子：先作为单子块初始化，再与同色邻块合并"""
+        grid = self.board.grid
+        idx = y * self.board.size + x
+        self.parent[idx] = idx
+        self.next_stone[idx] = idx
+        self.count[idx] = 1
+        self.group_bb[idx] = self.board.bits[idx]
+        for nidx in self.board.neighbors[idx]:
+            if grid[nidx] == color:
+                self._union(idx, nidx)
+
+    def _capture_opponents(self, x, y, color):
+        """提掉邻近无气的对方棋子，返回被提子的一维下标列表"""
+        n = self.board.size
+        grid, nxt = self.board.grid, self.next_stone
         opponent = self.opposite(color)
         captured = []
-        for nx, ny in self._neighbors(x, y):
-            if self.board.get(nx, ny) == opponent:
-                group, libs = self._group_dfs(nx, ny, opponent)
-                if len(libs) == 0:  # 无气，提子
-                    captured.extend(group)
-        if not pretend and captured:
-            self.board.remove_stones(captured)
+        for nidx in self.board.neighbors[y * n + x]:
+            # 同一块被提后已变为空点，不会重复处理
+            if grid[nidx] != opponent:
+                continue
+            root = find_root(self.parent, nidx)
+            if self._liberties(self.group_bb[root]):
+                continue
+            # 沿环收集整块；被提的点再次落子时由 _add_stone 重新初始化
+            start = len(captured)
+            idx = root
+            while True:
+                captured.append(idx)
+                idx = nxt[idx]
+                if idx == root:
+                    break
+            self.board.remove_stones([(i % n, i // n) for i in captured[start:]])
         return captured
 
     # 终局点击 pass 两次即可，胜负判断采用极简“地+子”：
     def score(self):
-        black, white = 0, 0
-        for y in range(self.board.size):
-            for x in range(self.board.size):
-                stone = self.board.get(x, y)
-                if stone == BLACK:
-                    black += 1
-                elif stone == WHITE:
-                    white += 1
-        return black, white
+        grid = self.board.grid
+        return grid.count(BLACK), grid.count(WHITE)
 
 
 # ───────────────────────────────────────────────
 # 玩家
 # ───────────────────────────────────────────────
 class Player:
-    def __init__(self, name: str, color: str):
+    def __init__(self, name: str, color: int):
         self.name = name
-        self.color = color  # "B" or "W"
+        self.color = color  # BLACK or WHITE
 
 
 # ───────────────────────────────────────────────
@@ -261,9 +492,21 @@ class GameController:
         self.rule: Optional[Rule] = None
         self.players: List[Player] = []
         self.current_idx: int = 0  # 当前轮到的玩家索引
+        # 指令名 -> 处理方法；方法接收指令名之后的参数串，返回 True 表示结束主循环
+        self._dispatch = {
+            "help": self.print_help,
+            "start": self.start_game,
+            "move": self.command_move,
+            "pass": self.command_pass,
+            "undo": self.command_undo,
+            "resign": self.command_resign,
+            "save": self.command_save,
+            "load": self.command_load,
+            "exit": self.command_exit,
+        }
 
     # ── 高层 API ────────────────────────────────
-    def start_game(self):
+    def start_game(self, args: str = ""):
         game_type = input("请选择游戏类型（gomoku/go）：").strip().lower()
         size = int(input("请输入棋盘大小（8-19）：").strip())
         self.board = Board(size)
@@ -290,40 +533,23 @@ class GameController:
         print("输入 'help' 查看指令列表")
         while True:
             try:
-                cmd = input("> ").strip()
-                if cmd == "help":
-                    self.print_help()
-                elif cmd == "start":
-                    self.start_game()
-                elif cmd.startswith("move"):
-                    self.command_move(cmd)
-                elif cmd == "pass":
-                    self.command_pass()
-                elif cmd == "undo":
-                    self.command_undo()
-                elif cmd == "resign":
-                    print(f"{self.current_player.name} 认输，对局结束")
-                    break
-                elif cmd.startswith("save"):
-                    self.command_save(cmd)
-                elif cmd.startswith("load"):
-                    self.command_load(cmd)
-                elif cmd == "exit":
-                    print("再见！")
-                    break
-                else:
+                parts = input("> ").split(maxsplit=1)
+                handler = self._dispatch.get(parts[0]) if parts else None
+                if handler is None:
                     print("无效指令，输入 'help' 获取帮助")
+                elif handler(parts[1] if len(parts) > 1 else ""):
+                    break
             except Exception as e:
                 print(f"错误：{e}")
 
     # ─────────────────────────────────────────
     # 各指令实现
     # ─────────────────────────────────────────
-    def command_move(self, cmd: str):
+    def command_move(self, args: str):
         if self.board is None:
             print("请先 start 开始游戏")
             return
-        match = re.match(r"move\s+(\d+)\s+(\d+)", cmd)
+        match = _MOVE_RE.match(args)
         if not match:
             print("格式：move x y")
             return
@@ -339,7 +565,7 @@ class GameController:
             exit()
         self.switch_player()
 
-    def command_pass(self):
+    def command_pass(self, args: str = ""):
         if self.board is None or self.rule.name != "go":
             print("仅围棋支持 pass")
             return
@@ -351,7 +577,7 @@ class GameController:
             print("黑胜" if black > white else "白胜" if white > black else "平局")
             exit()
 
-    def command_undo(self):
+    def command_undo(self, args: str = ""):
         if self.board is None:
             print("尚未开始游戏")
             return
@@ -363,11 +589,20 @@ class GameController:
         except ValueError as ve:
             print(ve)
 
-    def command_save(self, cmd: str):
+    def command_resign(self, args: str = ""):
+        print(f"{self.current_player.name} 认输，对局结束")
+        return True
+
+    @staticmethod
+    def command_exit(args: str = ""):
+        print("再见！")
+        return True
+
+    def command_save(self, args: str):
         if self.board is None:
             print("尚未开始游戏")
             return
-        match = re.match(r"save\s+(\S+)", cmd)
+        match = _FILENAME_RE.match(args)
         if not match:
             print("格式：save filename")
             return
@@ -377,12 +612,16 @@ class GameController:
             "board": self.board.to_dict(),
             "current": self.current_idx
         }
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        if orjson is not None:
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(data))
+        else:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
         print(f"已保存到 {filename}")
 
-    def command_load(self, cmd: str):
-        match = re.match(r"load\s+(\S+)", cmd)
+    def command_load(self, args: str):
+        match = _FILENAME_RE.match(args)
         if not match:
             print("格式：load filename")
             return
@@ -390,8 +629,9 @@ class GameController:
         if not os.path.exists(filename):
             print("文件不存在")
             return
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(filename, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         # 还原棋盘和规则
         self.board = Board.from_dict(data["board"])
         rule_name = data["rule"]
@@ -402,7 +642,7 @@ class GameController:
         self.board.display()
 
     @staticmethod
-    def print_help():
+    def print_help(args: str = ""):
         print("""指令列表:
 start                 - 开始新游戏
 move x y              - 在 (x,y) 落子